@@ -2,22 +2,49 @@ import os
 import re
 import json
 import time
+import sqlite3
 import threading
 import webbrowser
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+import numpy as np
 import pandas as pd
-import requests
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when it isn't installed
+    orjson = None
 
 
 SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".shopee_bestseller_settings.json")
+SHOP_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".shopee_shop_name_cache.json")
+HTTP_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".shopee_http_cache.sqlite")
+HTTP_CACHE_TTL = 600  # seconds a cached API response stays valid
+
+
+def json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    return orjson.dumps(data) if orjson is not None else json.dumps(data, ensure_ascii=False).encode("utf-8")
 
 
-@dataclass
+_RE_SHOP_URL = re.compile(r"/shop/(\d+)")
+_RE_SHOP_QS = re.compile(r"(shopid|sellerid)=(\d+)", re.I)
+_RE_CAT_DOT = re.compile(r"[._-]cat[._-]?(\d+)", re.I)
+_RE_CAT_QS = re.compile(r"(category|catid)=(\d+)", re.I)
+
+
+@dataclass(slots=True)  # no per-instance __dict__; needs Python 3.10+
 class Product:
     title: str
     itemid: int
@@ -36,38 +63,136 @@ class Product:
     query: Optional[str] = None  # which keyword/query produced this row
 
 
+_PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+_PRODUCT_GETTERS = tuple((name, attrgetter(name)) for name in _PRODUCT_FIELDS)
+
+
+def products_to_frame(items: List[Product]) -> pd.DataFrame:
+    # one column per field via C-level getters resolved once at import; no asdict introspection/deepcopy per row
+    return pd.DataFrame({name: list(map(get, items)) for name, get in _PRODUCT_GETTERS})
+
+
+# formatted-for-display columns added on top of the Product fields
+DISPLAY_COLUMNS = ("price_text", "rating_text", "sold_fmt")
+TABLE_COLUMNS = ["title", "shop_name", "sold_fmt", "price_text", "rating_text", "url", "query"]
+TABLE_CHUNK = 500  # Treeview rows inserted per idle callback
+
+
+def add_display_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:  # untyped empty columns can't take string ops
+        return df.assign(**{c: "" for c in DISPLAY_COLUMNS})
+    fmt2 = "{:.2f}".format
+    price_range = df["price_min"].map(fmt2) + " - " + df["price_max"].map(fmt2) + " " + df["currency"]
+    price_single = df["price"].map(fmt2) + " " + df["currency"]
+    df["price_text"] = np.where(df["price_min"] != df["price_max"], price_range, price_single)
+    rating = df["rating"].map(fmt2)
+    df["rating_text"] = np.where(df["rating_count"] > 0, rating + " / " + df["rating_count"].astype(str) + " รีวิว", rating)
+    df["sold_fmt"] = df["historical_sold"].map("{:,}".format)
+    return df
+
+
+class ResponseCache:
+    # raw GET response bodies on disk, keyed by URL + sorted query, so repeat searches skip the network
+    def __init__(self, path: str = HTTP_CACHE_PATH, ttl: float = HTTP_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored REAL, body BLOB)")
+            self._db.execute("DELETE FROM responses WHERE stored < ?", (time.time() - ttl,))
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Any]) -> str:
+        return url + "?" + urlencode(sorted(params.items()))
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT stored, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and time.time() - row[0] < self.ttl:
+            return row[1]
+        return None
+
+    def put(self, key: str, body: bytes):
+        with self._lock:
+            if self._db is None:
+                return
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, time.time(), body))
+
+    def close(self):
+        # a fetch still running after this just stops hitting the cache
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
 class ShopeeClient:
-    def __init__(self, domain="shopee.co.th", user_agent: Optional[str] = None, timeout: int = 20, delay: float = 0.8, stop_event: Optional[threading.Event] = None):
+    def __init__(self, domain="shopee.co.th", user_agent: Optional[str] = None, timeout: int = 20, delay: float = 0.8, stop_event: Optional[threading.Event] = None,
+                 max_workers: int = 10, shop_names: Optional[Dict[int, str]] = None, cache: Optional[ResponseCache] = None):
         self.domain = domain
         self.base = f"https://{domain}"
-        self.sess = requests.Session()
-        self.sess.headers.update({
-            "User-Agent": user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Referer": self.base + "/",
-            "Accept-Language": "th-TH,th;q=0.9,en-US;q=0.8,en;q=0.7"
-        })
-        self.timeout = timeout
+        # HTTP/2 multiplexes concurrent page/shop requests over one pooled TLS connection;
+        # the transport doesn't retry, _get owns 429 backoff
+        self.sess = httpx.Client(
+            http2=True,
+            headers={
+                "User-Agent": user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+                "Accept": "application/json, text/plain, */*",
+                "Referer": self.base + "/",
+                "Accept-Language": "th-TH,th;q=0.9,en-US;q=0.8,en;q=0.7"
+            },
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=max(20, max_workers))
+        )
         self.delay = delay
         self.stop_event = stop_event or threading.Event()
+        self.max_workers = max_workers
+        # caps in-flight requests across every thread sharing this client
+        self._slots = threading.BoundedSemaphore(max_workers)
+        # shopid -> name, shared across calls (and across runs when the caller passes a persisted dict)
+        self._shop_name_cache: Dict[int, str] = shop_names if shop_names is not None else {}
+        self.cache = cache
 
     def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(url, params)
+            body = self.cache.get(cache_key)
+            if body is not None:
+                return json_loads(body)
         for attempt in range(6):
             if self.stop_event.is_set():
                 return {}
             try:
-                r = self.sess.get(url, params=params, timeout=self.timeout)
+                with self._slots:
+                    r = self.sess.get(url, params=params)
                 if r.status_code == 429:
-                    time.sleep(self.delay * (attempt + 1) * 2)
+                    self.stop_event.wait(self._retry_after(r) or self.delay * (attempt + 1) * 2)
                     continue
                 r.raise_for_status()
-                return r.json()
-            except requests.RequestException:
+                data = json_loads(r.content)
+                # Shopee reports throttling/anti-bot rejections as 200 + "error"; never cache those
+                if cache_key is not None and isinstance(data, dict) and not data.get("error"):
+                    self.cache.put(cache_key, r.content)
+                return data
+            except (httpx.HTTPError, ValueError):
                 if attempt >= 5:
                     raise
-                time.sleep(self.delay * (attempt + 1))
+                self.stop_event.wait(self.delay * (attempt + 1))
         return {}
 
+    @staticmethod
+    def _retry_after(r) -> Optional[float]:
+        # only the delta-seconds form; anything else falls back to our own backoff
+        try:
+            return min(max(float(r.headers.get("Retry-After") or 0), 0.0), 60.0) or None
+        except ValueError:
+            return None
+
     def search(self, keyword: str, page: int = 0, page_size: int = 60, by: str = "sales", order: str = "desc",
                price_min: Optional[int] = None, price_max: Optional[int] = None, category_id: Optional[int] = None) -> Dict[str, Any]:
         url = f"{self.base}/api/v4/search/search_items"
@@ -114,54 +239,47 @@ class ShopeeClient:
             pass
         return None
 
+    def _lookup_shop_name(self, shopid: int) -> str:
+        name = self._shop_name_cache.get(shopid)
+        if name or self.stop_event.is_set():
+            return name or ""
+        name = self.get_shop_info(shopid) or ""
+        if name:
+            self._shop_name_cache[shopid] = name
+        return name
+
     @staticmethod
-    def _price_divisor(v: int) -> float:
-        if v and v > 100000:
-            return 100000.0
-        return 100.0
+    def _page_items(data: Dict[str, Any]) -> List[Any]:
+        return (data.get("items") or []) if isinstance(data, dict) else []
 
     def to_product(self, raw: Dict[str, Any], query: Optional[str] = None) -> Product:
+        # hot path (every item of every page): straight-line reads, no helper calls or temporaries
         itemid = raw.get("itemid") or 0
         shopid = raw.get("shopid") or 0
 
         price_raw = raw.get("price") or 0
         price_min_raw = raw.get("price_min") or price_raw
         price_max_raw = raw.get("price_max") or price_raw
-        div = self._price_divisor(max(price_raw, price_min_raw, price_max_raw))
-
-        def to_float(v): return float(v) / div if v else 0.0
-
-        price = to_float(price_raw)
-        price_min = to_float(price_min_raw)
-        price_max = to_float(price_max_raw)
-
-        currency = raw.get("currency") or ""
-        hist_sold = raw.get("historical_sold") or 0
-        sold_recent = raw.get("sold")
+        div = 100000.0 if price_raw > 100000 or price_min_raw > 100000 or price_max_raw > 100000 else 100.0
 
         rating_info = raw.get("item_rating") or {}
-        rating = float(rating_info.get("rating_star") or 0)
-        rating_count = int(sum(rating_info.get("rating_count") or [0]*6))
-        stock = raw.get("stock") or 0
-
-        name = raw.get("name") or ""
-        url = f"{self.base}/product/{shopid}/{itemid}"
+        rc = rating_info.get("rating_count")
 
         return Product(
-            title=name,
+            title=raw.get("name") or "",
             itemid=itemid,
             shopid=shopid,
-            shop_name=None,
-            price=price,
-            price_min=price_min,
-            price_max=price_max,
-            currency=currency,
-            historical_sold=hist_sold,
-            sold_recent=sold_recent,
-            rating=rating,
-            rating_count=rating_count,
-            stock=stock,
-            url=url,
+            shop_name=raw.get("shop_name") or None,
+            price=price_raw / div if price_raw else 0.0,
+            price_min=price_min_raw / div if price_min_raw else 0.0,
+            price_max=price_max_raw / div if price_max_raw else 0.0,
+            currency=raw.get("currency") or "",
+            historical_sold=raw.get("historical_sold") or 0,
+            sold_recent=raw.get("sold"),
+            rating=float(rating_info.get("rating_star") or 0),
+            rating_count=int(sum(rc)) if rc else 0,
+            stock=raw.get("stock") or 0,
+            url=f"{self.base}/product/{shopid}/{itemid}",
             query=query
         )
 
@@ -176,40 +294,61 @@ class ShopeeClient:
         category_id: Optional[int] = None,
         shopid: Optional[int] = None,
         query_label: Optional[str] = None
-    ) -> List[Product]:
+    ) -> pd.DataFrame:
+        pages: List[Dict[str, Any]] = []
+        if max_pages > 0:
+            # pages go out in concurrent waves of max_workers; a wave that comes back with an
+            # empty page has reached the end, so no further waves are requested
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, max_pages)) as ex:
+                for start in range(0, max_pages, self.max_workers):
+                    if self.stop_event.is_set():
+                        break
+                    wave = range(start, min(start + self.max_workers, max_pages))
+                    if shopid:
+                        futures = [ex.submit(self.shop_search, shopid=shopid, page=page) for page in wave]
+                    else:
+                        futures = [ex.submit(self.search, keyword or "", page=page, price_min=price_min, price_max=price_max, category_id=category_id)
+                                   for page in wave]
+                    pages.extend(f.result() for f in futures)
+                    if not all(self._page_items(data) for data in pages[start:]):
+                        break
+
         all_items: List[Product] = []
-        for page in range(max_pages):
-            if self.stop_event.is_set():
-                break
-            if shopid:
-                data = self.shop_search(shopid=shopid, page=page)
-            else:
-                data = self.search(keyword or "", page=page, price_min=price_min, price_max=price_max, category_id=category_id)
-            items = (data.get("items") or []) if isinstance(data, dict) else []
+        by_shop: Dict[int, List[Product]] = {}  # products still missing a shop name, by shopid
+        for data in pages:
+            items = self._page_items(data)
             if not items:
                 break
             for it in items:
                 raw = it.get("item_basic") if isinstance(it, dict) and "item_basic" in it else it
                 if not isinstance(raw, dict):
                     continue
+                # filter on the raw count so discarded items are never turned into Products
+                if (raw.get("historical_sold") or 0) < min_sold:
+                    continue
                 p = self.to_product(raw, query=query_label)
-                if p.historical_sold >= min_sold:
-                    all_items.append(p)
-            time.sleep(self.delay)
-
-        if fetch_shop_names and all_items and not self.stop_event.is_set():
-            unique_shopids = sorted(set(p.shopid for p in all_items))
-            cache: Dict[int, str] = {}
-            for sid in unique_shopids:
-                if self.stop_event.is_set():
-                    break
-                cache[sid] = self.get_shop_info(sid) or ""
-                time.sleep(0.2)
-            for p in all_items:
-                p.shop_name = cache.get(p.shopid) or None
-
-        all_items.sort(key=lambda x: (x.historical_sold, x.sold_recent or 0), reverse=True)
-        return all_items
+                all_items.append(p)
+                if p.shop_name:
+                    self._shop_name_cache.setdefault(p.shopid, p.shop_name)
+                else:
+                    by_shop.setdefault(p.shopid, []).append(p)
+
+        if fetch_shop_names and by_shop and not self.stop_event.is_set():
+            missing = [sid for sid in by_shop if sid not in self._shop_name_cache]
+            if missing:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as ex:
+                    list(ex.map(self._lookup_shop_name, missing))
+            for sid, products in by_shop.items():
+                name = self._shop_name_cache.get(sid)
+                if name:
+                    for p in products:
+                        p.shop_name = name
+
+        # best sellers first, then by recent sales (missing counts as 0); lexsort is stable, so ties keep page order
+        df = products_to_frame(all_items)
+        hist = df["historical_sold"].to_numpy()
+        recent = np.nan_to_num(df["sold_recent"].to_numpy(dtype=float), nan=0.0)
+        return df.iloc[np.lexsort((-recent, -hist))].reset_index(drop=True)
 
 
 class App(tk.Tk):
@@ -229,6 +368,7 @@ class App(tk.Tk):
         self.pages_var = tk.IntVar(value=3)
         self.min_sold_var = tk.IntVar(value=0)
         self.fetch_shop_var = tk.BooleanVar(value=True)
+        self.use_cache_var = tk.BooleanVar(value=True)
 
         self.price_min_var = tk.StringVar(value="")
         self.price_max_var = tk.StringVar(value="")
@@ -239,11 +379,18 @@ class App(tk.Tk):
         self.status_var = tk.StringVar(value="พร้อมใช้งาน")
         self.progress_var = tk.DoubleVar(value=0.0)
 
+        # domain -> {shopid: name}; shopids are only unique within a country site
+        self.shop_name_cache: Dict[str, Dict[int, str]] = {}
+        self.http_cache: Optional[ResponseCache] = None  # opened on first fetch that uses it
+
         self._build_ui()
         self._load_settings()
+        self._load_shop_cache()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.client: Optional[ShopeeClient] = None
-        self.results: List[Product] = []
+        self.results_df: Optional[pd.DataFrame] = None
+        self._table_token = 0  # bumped whenever the table is cleared, so stale chunked inserts stop
 
     def _build_ui(self):
         pad = {"padx": 8, "pady": 6}
@@ -300,6 +447,7 @@ class App(tk.Tk):
 
         row += 1
         ttk.Checkbutton(frm, text="ดึงชื่อร้านค้า", variable=self.fetch_shop_var).grid(row=row, column=0, columnspan=2, sticky="w")
+        ttk.Checkbutton(frm, text="ใช้แคช", variable=self.use_cache_var).grid(row=row, column=2, columnspan=2, sticky="w")
 
         row += 1
         ttk.Button(frm, text="ดึงข้อมูล", command=self.on_fetch).grid(row=row, column=0, sticky="we", **pad)
@@ -352,6 +500,7 @@ class App(tk.Tk):
             "pages": self.pages_var.get(),
             "min_sold": self.min_sold_var.get(),
             "fetch_shop": self.fetch_shop_var.get(),
+            "use_cache": self.use_cache_var.get(),
             "price_min": self.price_min_var.get(),
             "price_max": self.price_max_var.get(),
             "category": self.category_var.get(),
@@ -360,22 +509,23 @@ class App(tk.Tk):
             "batch_text": self.batch_text.get("1.0", "end").strip() if self.batch_keywords_var.get() else ""
         }
         try:
-            with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(SETTINGS_PATH, "wb") as f:
+                f.write(json_dumps(data))
         except Exception:
             pass
 
     def _load_settings(self):
         try:
             if os.path.exists(SETTINGS_PATH):
-                with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(SETTINGS_PATH, "rb") as f:
+                    data = json_loads(f.read())
                 self.domain_var.set(data.get("domain", self.domain_var.get()))
                 self.mode_var.set(data.get("mode", self.mode_var.get()))
                 self.keyword_var.set(data.get("keyword", ""))
                 self.pages_var.set(int(data.get("pages", 3)))
                 self.min_sold_var.set(int(data.get("min_sold", 0)))
                 self.fetch_shop_var.set(bool(data.get("fetch_shop", True)))
+                self.use_cache_var.set(bool(data.get("use_cache", True)))
                 self.price_min_var.set(str(data.get("price_min", "")))
                 self.price_max_var.set(str(data.get("price_max", "")))
                 self.category_var.set(str(data.get("category", "")))
@@ -389,6 +539,41 @@ class App(tk.Tk):
         except Exception:
             pass
 
+    def _save_shop_cache(self):
+        data = {domain: {str(k): v for k, v in list(names.items())} for domain, names in self.shop_name_cache.items() if names}
+        try:
+            with open(SHOP_CACHE_PATH, "wb") as f:
+                f.write(json_dumps(data))
+        except Exception:
+            pass
+
+    def _load_shop_cache(self):
+        try:
+            if os.path.exists(SHOP_CACHE_PATH):
+                with open(SHOP_CACHE_PATH, "rb") as f:
+                    data = json_loads(f.read())
+                self.shop_name_cache = {
+                    domain: {int(k): v for k, v in names.items() if v}
+                    for domain, names in data.items() if isinstance(names, dict)
+                }
+        except Exception:
+            pass
+
+    def _get_http_cache(self) -> Optional[ResponseCache]:
+        if self.http_cache is None:
+            try:
+                self.http_cache = ResponseCache()
+            except sqlite3.Error:
+                pass
+        return self.http_cache
+
+    def on_close(self):
+        self.stop_event.set()
+        self._save_shop_cache()
+        if self.http_cache is not None:
+            self.http_cache.close()
+        self.destroy()
+
     @staticmethod
     def parse_shopid(s: str) -> Optional[int]:
         s = (s or "").strip()
@@ -396,10 +581,10 @@ class App(tk.Tk):
             return None
         if s.isdigit():
             return int(s)
-        m = re.search(r"/shop/(\d+)", s)
+        m = _RE_SHOP_URL.search(s)
         if m:
             return int(m.group(1))
-        m = re.search(r"(shopid|sellerid)=(\d+)", s, re.I)
+        m = _RE_SHOP_QS.search(s)
         if m:
             return int(m.group(2))
         return None
@@ -411,10 +596,10 @@ class App(tk.Tk):
             return None
         if s.isdigit():
             return int(s)
-        m = re.search(r"[._-]cat[._-]?(\d+)", s, re.I)
+        m = _RE_CAT_DOT.search(s)
         if m:
             return int(m.group(1))
-        m = re.search(r"(category|catid)=(\d+)", s, re.I)
+        m = _RE_CAT_QS.search(s)
         if m:
             return int(m.group(2))
         return None
@@ -445,7 +630,6 @@ class App(tk.Tk):
 
     def on_fetch(self):
         self._save_settings()
-        self.stop_event.clear()
 
         domain = self.domain_var.get().strip() or "shopee.co.th"
         mode = self.mode_var.get()
@@ -475,23 +659,31 @@ class App(tk.Tk):
                 messagebox.showwarning("แจ้งเตือน", "กรุณากรอก keyword หรือใช้โหมดหลายคีย์เวิร์ด")
                 return
 
-        self.client = ShopeeClient(domain=domain, stop_event=self.stop_event)
+        # each fetch gets its own stop event and client; a fetch still running is told to stop
+        # and closes its own client when it finishes, so nothing is closed out from under it
+        self.stop_event.set()
+        stop_event = self.stop_event = threading.Event()
+        cache = self._get_http_cache() if self.use_cache_var.get() else None
+        client = self.client = ShopeeClient(domain=domain, stop_event=stop_event, shop_names=self.shop_name_cache.setdefault(domain, {}), cache=cache)
         self.status_var.set("กำลังดึงข้อมูล...")
         self.progress_var.set(0)
-        self.results.clear()
-        self.tree.delete(*self.tree.get_children())
-        self.update_idletasks()
+        self.results_df = None
+        self._clear_table()
 
         batch_list: List[str] = []
         if self.batch_keywords_var.get():
             raw = self.batch_text.get("1.0", "end").strip()
             batch_list = [line.strip() for line in raw.splitlines() if line.strip()]
 
+        def report_batch(done: int, kw: str):
+            self.status_var.set(f"ดึงข้อมูลแล้ว ({done}/{len(batch_list)}) : {kw}")
+            self.progress_var.set((done / len(batch_list)) * 100)
+
         def worker():
             try:
-                items_total: List[Product] = []
+                frames: List[pd.DataFrame] = []
                 if mode == "shop":
-                    items = self.client.fetch_best_sellers(
+                    items = client.fetch_best_sellers(
                         keyword=None,
                         max_pages=pages,
                         min_sold=min_sold,
@@ -502,27 +694,34 @@ class App(tk.Tk):
                         shopid=shopid,
                         query_label=f"shop:{shopid}"
                     )
-                    items_total.extend(items)
+                    frames.append(items)
                 else:
                     if batch_list:
-                        for idx, kw in enumerate(batch_list, start=1):
-                            if self.stop_event.is_set(): break
-                            self.status_var.set(f"ดึงข้อมูล ({idx}/{len(batch_list)}) : {kw}")
-                            items = self.client.fetch_best_sellers(
-                                keyword=kw,
-                                max_pages=pages,
-                                min_sold=min_sold,
-                                fetch_shop_names=fetch_shop,
-                                price_min=price_min_i,
-                                price_max=price_max_i,
-                                category_id=cat_i,
-                                shopid=None,
-                                query_label=kw
-                            )
-                            items_total.extend(items)
-                            self.after(0, lambda: self.progress_var.set((idx/len(batch_list))*100))
+                        # keywords are independent; the client's own semaphore and pool bound total requests
+                        by_keyword: Dict[str, pd.DataFrame] = {}
+                        with ThreadPoolExecutor(max_workers=min(8, len(batch_list))) as ex:
+                            futures = {
+                                ex.submit(
+                                    client.fetch_best_sellers,
+                                    keyword=kw,
+                                    max_pages=pages,
+                                    min_sold=min_sold,
+                                    fetch_shop_names=fetch_shop,
+                                    price_min=price_min_i,
+                                    price_max=price_max_i,
+                                    category_id=cat_i,
+                                    shopid=None,
+                                    query_label=kw
+                                ): kw
+                                for kw in batch_list
+                            }
+                            for done, fut in enumerate(as_completed(futures), start=1):
+                                kw = futures[fut]
+                                by_keyword[kw] = fut.result()
+                                self.after(0, report_batch, done, kw)
+                        frames.extend(by_keyword[kw] for kw in batch_list if kw in by_keyword)
                     else:
-                        items = self.client.fetch_best_sellers(
+                        items = client.fetch_best_sellers(
                             keyword=keyword,
                             max_pages=pages,
                             min_sold=min_sold,
@@ -533,36 +732,54 @@ class App(tk.Tk):
                             shopid=None,
                             query_label=keyword
                         )
-                        items_total.extend(items)
+                        frames.append(items)
 
-                seen = set()
-                deduped: List[Product] = []
-                for p in items_total:
-                    key = (p.shopid, p.itemid)
-                    if key in seen: continue
-                    seen.add(key)
-                    deduped.append(p)
+                frames = [f for f in frames if not f.empty]
+                df = pd.concat(frames, ignore_index=True) if frames else products_to_frame([])
+                # format once here, off the UI thread; the table and export both read this frame
+                deduped = add_display_columns(df.drop_duplicates(["shopid", "itemid"], keep="first", ignore_index=True))
 
-                self.results = deduped
+                if stop_event is not self.stop_event:
+                    return  # superseded by a newer fetch; leave its table and status alone
+                self.results_df = deduped
                 self.after(0, self._populate_table)
                 self.after(0, lambda: self.status_var.set(f"พบ {len(deduped)} รายการ"))
-                self.after(0, lambda: self.progress_var.set(100 if not self.stop_event.is_set() else 0))
+                self.after(0, lambda: self.progress_var.set(100 if not stop_event.is_set() else 0))
             except Exception as e:
+                if stop_event is not self.stop_event:
+                    return
                 self.after(0, lambda: messagebox.showerror("เกิดข้อผิดพลาด", str(e)))
                 self.after(0, lambda: self.status_var.set("ล้มเหลว"))
                 self.after(0, lambda: self.progress_var.set(0))
+            finally:
+                client.sess.close()
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _populate_table(self):
+    def _clear_table(self) -> int:
+        self._table_token += 1
         self.tree.delete(*self.tree.get_children())
-        for p in self.results:
-            price_text = f"{p.price_min:.2f} - {p.price_max:.2f} {p.currency}" if p.price_min != p.price_max else f"{p.price:.2f} {p.currency}"
-            rating_text = f"{p.rating:.2f} / {p.rating_count} รีวิว" if p.rating_count else f"{p.rating:.2f}"
-            self.tree.insert("", "end", values=(p.title, p.shop_name or "", f"{p.historical_sold:,}", price_text, rating_text, p.url, p.query or ""))
+        self.update_idletasks()
+        return self._table_token
+
+    def _populate_table(self):
+        token = self._clear_table()
+        if self.results_df is None or self.results_df.empty:
+            return
+        rows = list(self.results_df[TABLE_COLUMNS].fillna("").itertuples(index=False, name=None))
+        self._insert_rows(rows, 0, token)
+
+    def _insert_rows(self, rows: List[tuple], start: int, token: int):
+        # insert in chunks from idle callbacks so the window keeps redrawing on large result sets
+        if token != self._table_token:
+            return
+        for values in rows[start:start + TABLE_CHUNK]:
+            self.tree.insert("", "end", values=values)
+        if start + TABLE_CHUNK < len(rows):
+            self.after_idle(self._insert_rows, rows, start + TABLE_CHUNK, token)
 
     def on_export(self):
-        if not self.results:
+        if self.results_df is None or self.results_df.empty:
             messagebox.showwarning("ยังไม่มีข้อมูล", "กรุณาดึงข้อมูลก่อน")
             return
 
@@ -575,12 +792,13 @@ class App(tk.Tk):
         if not path:
             return
 
-        df = pd.DataFrame([asdict(p) for p in self.results])
+        df = self.results_df.drop(columns=list(DISPLAY_COLUMNS))
         try:
             if path.lower().endswith(".csv"):
                 df.to_csv(path, index=False, encoding="utf-8-sig")
             else:
-                df.to_excel(path, index=False)
+                # constant_memory streams rows to disk instead of holding the whole sheet
+                df.to_excel(path, index=False, engine="xlsxwriter", engine_kwargs={"options": {"constant_memory": True}})
             messagebox.showinfo("สำเร็จ", f"บันทึกไฟล์แล้ว:\n{path}")
         except Exception as e:
             messagebox.showerror("บันทึกล้มเหลว", str(e))